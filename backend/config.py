@@ -13,17 +13,23 @@ class Settings:
     
     # AI Model Configuration
     WHISPER_MODEL: str = os.getenv("WHISPER_MODEL", "base")  # tiny, base, small, medium, large
-    SUMMARIZER_MODEL: str = os.getenv("SUMMARIZER_MODEL", "facebook/bart-large-cnn")
+    WHISPER_BACKEND: str = os.getenv("WHISPER_BACKEND", "faster-whisper")  # faster-whisper, onnx-int8
+    WHISPER_COMPUTE_TYPE: str = os.getenv("WHISPER_COMPUTE_TYPE", "auto")  # auto, int8, int8_float16 (GPU), float16, float32
+    WHISPER_BATCH_SIZE: int = int(os.getenv("WHISPER_BATCH_SIZE", "8"))  # 30s audio chunks decoded per batch
+    WHISPER_NUM_WORKERS: int = int(os.getenv("WHISPER_NUM_WORKERS", "2"))  # concurrent transcriptions per process
+    WHISPER_WEIGHT_CACHE: bool = os.getenv("WHISPER_WEIGHT_CACHE", "true").lower() == "true"
+    WHISPER_FALLBACK_MODEL: str = os.getenv("WHISPER_FALLBACK_MODEL", "base.en")  # whisper.cpp GGML model
+    SUMMARIZER_TYPE: str = os.getenv("SUMMARIZER_TYPE", "huggingface")  # huggingface (distilled), bart-large, t5
+    SUMMARIZER_MODEL: str = os.getenv("SUMMARIZER_MODEL", "sshleifer/distilbart-cnn-12-6")
     NER_MODEL: str = os.getenv("NER_MODEL", "dbmdz/bert-large-cased-finetuned-conll03-english")
+    TORCH_NUM_THREADS: int = int(os.getenv("TORCH_NUM_THREADS", str(max(1, (os.cpu_count() or 2) // 2))))
+    NER_BATCH_SIZE: int = int(os.getenv("NER_BATCH_SIZE", "16"))
+    SPACY_BATCH_SIZE: int = int(os.getenv("SPACY_BATCH_SIZE", "64"))
     
     # OpenAI Configuration (optional)
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
     
-    # Google Speech-to-Text Configuration (optional)
-    GOOGLE_CLOUD_PROJECT: Optional[str] = os.getenv("GOOGLE_CLOUD_PROJECT")
-    GOOGLE_APPLICATION_CREDENTIALS: Optional[str] = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-    
     # File Upload Configuration
     MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", "100")) * 1024 * 1024  # 100MB default
     ALLOWED_AUDIO_FORMATS: list = ["wav", "mp3", "mp4", "m4a", "flac", "ogg"]
@@ -33,6 +39,11 @@ class Settings:
     MAX_TRANSCRIPT_LENGTH: int = int(os.getenv("MAX_TRANSCRIPT_LENGTH", "50000"))
     DEFAULT_SUMMARY_LENGTH: int = int(os.getenv("DEFAULT_SUMMARY_LENGTH", "150"))
     MIN_SUMMARY_LENGTH: int = int(os.getenv("MIN_SUMMARY_LENGTH", "50"))
+    # Whisper resamples and handles silence itself; ffmpeg preprocessing is opt-in
+    ENABLE_PREPROCESSING: bool = os.getenv("ENABLE_PREPROCESSING", "false").lower() == "true"
+    
+    # Cached summaries/participants per process, keyed by transcript hash
+    RESULT_CACHE_SIZE: int = int(os.getenv("RESULT_CACHE_SIZE", "256"))
     
     # CORS Configuration
     CORS_ORIGINS: list = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:5173").split(",")
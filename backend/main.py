@@ -2,16 +2,23 @@
 AI Meeting Summarizer FastAPI Backend
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 import tempfile
 import os
+import uuid
+import time
 from datetime import datetime
 import json
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import aiofiles
+import torch
 import logging
+import re
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,7 +30,10 @@ from text_summarizer import TextSummarizer
 from task_extractor import TaskExtractor
 from config import settings
 
-app = FastAPI(title="AI Meeting Summarizer", version="1.0.0")
+# Read uploads in 1MB chunks so memory stays bounded regardless of file size
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+app = FastAPI(title="AI Meeting Summarizer", version="1.0.0", default_response_class=ORJSONResponse)
 
 # CORS middleware for React frontend
 app.add_middleware(
@@ -58,29 +68,83 @@ class ProcessingStatus(BaseModel):
     progress: int
     message: str
 
+# Background summarization jobs for uploaded audio, keyed by job id.
+# Held in this process's memory, so the server must run as a single worker
+MAX_STORED_JOBS = 100
+# Finished jobs stay available for polling this long (seconds)
+JOB_TTL_SECONDS = 60 * 60
+jobs: Dict[str, dict] = {}
+# Expiry time of each finished job, in the order the jobs finished
+job_expiry: Dict[str, float] = {}
+
+def expire_jobs():
+    """Drop finished jobs whose polling window has passed"""
+    now = time.monotonic()
+    for job_id in [job_id for job_id, expires_at in job_expiry.items() if expires_at <= now]:
+        del job_expiry[job_id]
+        jobs.pop(job_id, None)
+
+def has_job_capacity() -> bool:
+    """Make room for a new job by evicting the oldest finished one; False if every stored job is still processing"""
+    expire_jobs()
+    if len(jobs) >= MAX_STORED_JOBS and job_expiry:
+        job_id = next(iter(job_expiry))
+        del job_expiry[job_id]
+        jobs.pop(job_id, None)
+    return len(jobs) < MAX_STORED_JOBS
+
 # Initialize processors
 audio_processor = None
 text_summarizer = None
 task_extractor = None
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize AI models on startup"""
+def load_models():
+    """Load AI models into the module-level processors"""
     global audio_processor, text_summarizer, task_extractor
     
+    # Process-wide: NER and the PyTorch summarizers run alongside the Whisper and
+    # ONNX Runtime pools, so torch shouldn't claim every core
+    torch.set_num_threads(settings.TORCH_NUM_THREADS)
+    
     try:
         logger.info("Initializing AI models...")
-        audio_processor = AudioProcessor()
-        text_summarizer = TextSummarizer(model_type="huggingface")
-        task_extractor = TaskExtractor()
+        # Model loads are independent and mostly disk I/O or native code, so load them side by side
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            audio_future = executor.submit(AudioProcessor)
+            summarizer_future = executor.submit(TextSummarizer, model_type=settings.SUMMARIZER_TYPE)
+            extractor_future = executor.submit(TaskExtractor)
+            audio_processor = audio_future.result()
+            text_summarizer = summarizer_future.result()
+            task_extractor = extractor_future.result()
         logger.info("AI models initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize AI models: {e}")
         # Initialize with fallback processors
         audio_processor = AudioProcessor()
-        text_summarizer = TextSummarizer(model_type="huggingface")
+        text_summarizer = TextSummarizer(model_type=settings.SUMMARIZER_TYPE)
         task_extractor = TaskExtractor()
 
+async def warmup_models():
+    """Run one small request through each model so the first real request doesn't pay for lazy init"""
+    warmup_text = "John will send the project report to the team by Friday. " * 10
+    
+    try:
+        logger.info("Warming up AI models...")
+        await asyncio.to_thread(audio_processor.warmup)
+        await text_summarizer.summarize(warmup_text, max_length=30, min_length=10)
+        await task_extractor.extract_tasks(warmup_text)
+        await task_extractor.extract_participants(warmup_text)
+        logger.info("AI models warmed up")
+    except Exception as e:
+        logger.warning(f"Model warmup failed: {e}")
+
+@app.on_event("startup")
+async def startup_event():
+    """Initialize AI models on startup"""
+    # Built in each worker after fork: the runtimes' thread pools don't survive fork()
+    load_models()
+    await warmup_models()
+
 @app.get("/")
 async def root():
     return {"message": "AI Meeting Summarizer API", "version": "1.0.0"}
@@ -99,9 +163,10 @@ async def health_check():
     }
 
 @app.post("/upload-audio", response_model=dict)
-async def upload_audio(file: UploadFile = File(...)):
+async def upload_audio(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     """
-    Upload and process audio file
+    Upload and transcribe audio file; the summary is produced in the background
+    and can be polled at /jobs/{job_id}
     """
     # Check file type
     allowed_types = ['audio/', 'video/']
@@ -110,43 +175,93 @@ async def upload_audio(file: UploadFile = File(...)):
     
     # Check file size
     if file.size and file.size > settings.MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail=f"File size exceeds {settings.MAX_FILE_SIZE // (1024*1024)}MB limit")
+        raise HTTPException(status_code=413, detail=f"File size exceeds {settings.MAX_FILE_SIZE // (1024*1024)}MB limit")
     
+    # Refuse before transcribing rather than after, when the job store is full of running jobs
+    if not has_job_capacity():
+        raise HTTPException(status_code=503, detail="Too many summaries in progress, please retry later")
+    
+    tmp_file_path = None
     try:
         logger.info(f"Processing audio file: {file.filename}")
         
         # Save uploaded file temporarily
         file_extension = os.path.splitext(file.filename)[1] if file.filename else '.wav'
         with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
             tmp_file_path = tmp_file.name
         
-        # Preprocess audio for better results
-        preprocessed_path = audio_processor.preprocess_audio(tmp_file_path)
+        # Stream the upload to disk in fixed-size chunks, enforcing the size limit as we go
+        bytes_written = 0
+        async with aiofiles.open(tmp_file_path, 'wb') as out_file:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                bytes_written += len(chunk)
+                if bytes_written > settings.MAX_FILE_SIZE:
+                    break
+                await out_file.write(chunk)
+        
+        if bytes_written > settings.MAX_FILE_SIZE:
+            raise HTTPException(status_code=413, detail=f"File size exceeds {settings.MAX_FILE_SIZE // (1024*1024)}MB limit")
+        
+        # Preprocess audio only when enabled; Whisper decodes the upload directly otherwise
+        audio = tmp_file_path
+        if settings.ENABLE_PREPROCESSING:
+            audio = audio_processor.preprocess_audio(tmp_file_path)
         
         # Process audio to text
         logger.info("Starting transcription...")
-        transcript = await audio_processor.transcribe(preprocessed_path)
+        transcript = await audio_processor.transcribe(audio)
         logger.info(f"Transcription completed. Length: {len(transcript)} characters")
         
-        # Clean up temp file
-        os.unlink(tmp_file_path)
-        if preprocessed_path != tmp_file_path:
-            os.unlink(preprocessed_path)
-        
-        # Process the transcript
-        summary_result = await process_transcript(transcript)
+        # Process the transcript after responding
+        # Checked again: other uploads may have filled the store during transcription
+        if not has_job_capacity():
+            raise HTTPException(status_code=503, detail="Too many summaries in progress, please retry later")
+        job_id = uuid.uuid4().hex
+        jobs[job_id] = {"status": "processing", "summary": None, "error": None}
+        background_tasks.add_task(run_summary_job, job_id, transcript)
         
         return {
             "status": "success",
-            "transcript": transcript,
-            "summary": summary_result
+            "job_id": job_id,
+            "transcript": transcript
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing audio: {e}")
         raise HTTPException(status_code=500, detail=f"Error processing audio: {str(e)}")
+    finally:
+        # Clean up temp file
+        if tmp_file_path and os.path.exists(tmp_file_path):
+            os.unlink(tmp_file_path)
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Get the status and summary of a background summarization job
+    """
+    expire_jobs()
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return {"job_id": job_id, **job}
+
+async def run_summary_job(job_id: str, transcript: str):
+    """
+    Summarize an uploaded transcript and store the result on its job
+    """
+    try:
+        summary = await process_transcript(transcript)
+        job_result = {"status": "completed", "summary": summary, "error": None}
+    except Exception as e:
+        logger.error(f"Summary job {job_id} failed: {e}")
+        job_result = {"status": "failed", "summary": None, "error": str(e)}
+    
+    if job_id in jobs:
+        jobs[job_id] = job_result
+        job_expiry[job_id] = time.monotonic() + JOB_TTL_SECONDS
 
 @app.post("/process-text", response_model=MeetingSummary)
 async def process_text(input_data: TextInput):
@@ -168,6 +283,23 @@ async def process_text(input_data: TextInput):
         logger.error(f"Error processing text: {e}")
         raise HTTPException(status_code=500, detail=f"Error processing text: {str(e)}")
 
+async def summarize_transcript(transcript: str) -> str:
+    """
+    Summarize transcript, skipping the model for inputs too short to condense
+    """
+    word_count = len(transcript.split())
+    if word_count < settings.MIN_SUMMARY_LENGTH * 2:
+        logger.info(f"Transcript has only {word_count} words, using it as the summary")
+        return transcript.strip()
+    
+    # Don't let the model generate more than half the input length
+    max_length = min(settings.DEFAULT_SUMMARY_LENGTH, word_count // 2)
+    return await text_summarizer.summarize(
+        transcript,
+        max_length=max_length,
+        min_length=min(settings.MIN_SUMMARY_LENGTH, max_length)
+    )
+
 async def process_transcript(transcript: str) -> MeetingSummary:
     """
     Process transcript to extract summary, tasks, and action points
@@ -176,11 +308,7 @@ async def process_transcript(transcript: str) -> MeetingSummary:
         logger.info("Starting transcript processing...")
         
         # Run all processing tasks concurrently for better performance
-        summary_task = text_summarizer.summarize(
-            transcript, 
-            max_length=settings.DEFAULT_SUMMARY_LENGTH,
-            min_length=settings.MIN_SUMMARY_LENGTH
-        )
+        summary_task = summarize_transcript(transcript)
         tasks_task = task_extractor.extract_tasks(transcript)
         action_points_task = task_extractor.extract_action_points(transcript)
         participants_task = task_extractor.extract_participants(transcript)
@@ -211,6 +339,10 @@ async def process_transcript(transcript: str) -> MeetingSummary:
         logger.error(f"Error in transcript processing: {e}")
         raise Exception(f"Error in transcript processing: {str(e)}")
 
+# Keyword checks for confidence scoring; case-insensitive substring matches
+_TASK_KEYWORDS_RE = re.compile(r'action|task|deadline|assign', re.IGNORECASE)
+_MEETING_KEYWORDS_RE = re.compile(r'meeting|discuss|decision|next', re.IGNORECASE)
+
 def calculate_confidence_score(transcript: str, summary: str, tasks: List[Task]) -> float:
     """
     Calculate confidence score based on processing results
@@ -228,10 +360,10 @@ def calculate_confidence_score(transcript: str, summary: str, tasks: List[Task])
         score += 0.2
     
     # Additional scoring based on content quality
-    if any(word in transcript.lower() for word in ['action', 'task', 'deadline', 'assign']):
+    if _TASK_KEYWORDS_RE.search(transcript):
         score += 0.1
     
-    if any(word in transcript.lower() for word in ['meeting', 'discuss', 'decision', 'next']):
+    if _MEETING_KEYWORDS_RE.search(transcript):
         score += 0.1
     
     return min(score, 1.0)
@@ -2,42 +2,187 @@
 Task and action item extraction module
 """
 
+import ahocorasick
+import asyncio
+import hashlib
 import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from typing import List, Dict, Optional
+import torch
 from transformers import pipeline, AutoTokenizer, AutoModelForTokenClassification
 from datetime import datetime, timedelta
 import logging
 
+from config import settings
+
 logger = logging.getLogger(__name__)
 
-# Try to load spaCy model
-try:
-    import spacy
-    nlp = spacy.load("en_core_web_sm")
-    logger.info("spaCy model loaded successfully")
-except (OSError, ImportError) as e:
-    logger.warning(f"spaCy model not available: {e}")
-    nlp = None
+
+# Precompiled patterns, built once at import instead of on every call
+_ACTION_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in [
+    r'action item[s]?:?\s*([^.!?\n]+)',
+    r'action[s]?:?\s*([^.!?\n]+)',
+    r'next step[s]?:?\s*([^.!?\n]+)',
+    r'follow[- ]?up:?\s*([^.!?\n]+)',
+    r'to[- ]?do:?\s*([^.!?\n]+)',
+    r'we need to\s+([^.!?\n]+)',
+    r'we should\s+([^.!?\n]+)',
+    r'let\'s\s+([^.!?\n]+)',
+    r'someone should\s+([^.!?\n]+)',
+    r'we must\s+([^.!?\n]+)',
+    r'it would be good to\s+([^.!?\n]+)'
+])
+
+_DECISION_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in [
+    r'decided to\s+([^.!?\n]+)',
+    r'agreed to\s+([^.!?\n]+)',
+    r'committed to\s+([^.!?\n]+)',
+    r'will proceed with\s+([^.!?\n]+)'
+])
+
+_SPEAKER_PATTERNS = tuple(re.compile(p, re.MULTILINE) for p in [
+    r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?):',  # "John Smith:"
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+said',  # "John said"
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+mentioned',  # "John mentioned"
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+will',  # "John will"
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+can',  # "John can"
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+should',  # "John should"
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+needs? to',  # "John needs to"
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+is responsible',  # "John is responsible"
+])
+
+# Common words the speaker patterns can capture as names
+_EXCLUDED_SPEAKER_WORDS = frozenset({
+    'the', 'and', 'but', 'for', 'you', 'this', 'that', 'we', 'they', 'it', 'meeting', 'team'
+})
+_FALSE_POSITIVE_PARTICIPANT_WORDS = ('meeting', 'team', 'group', 'everyone', 'somebody', 'anyone')
+
+# (pattern, reversed) pairs; "assign X to Y" captures the task before the assignee
+_ASSIGNMENT_PATTERNS = tuple((re.compile(p, re.IGNORECASE), p.startswith('assign')) for p in [
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+will\s+([^.!?\n]+)',
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+should\s+([^.!?\n]+)',
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+needs? to\s+([^.!?\n]+)',
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+is responsible for\s+([^.!?\n]+)',
+    r'assign(?:ed)?\s+([^.!?\n]+?)\s+to\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+can\s+([^.!?\n]+)',
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+must\s+([^.!?\n]+)',
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+has to\s+([^.!?\n]+)',
+])
+
+# Every assignee-first pattern above as one alternation. A sentence it does not match
+# cannot match any of them, so one scan rules out most sentences
+_COMBINED_TASK_RE = re.compile(
+    r'(?P<assignee>[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+'
+    r'(?P<modal>will|should|can|must|has to|needs? to|is responsible for)\s+'
+    r'(?P<task>[^.!?\n]+)',
+    re.IGNORECASE
+)
+
+_DATE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in [
+    r'\d{1,2}[/-]\d{1,2}[/-]\d{4}',
+    r'\d{4}-\d{2}-\d{2}',
+    r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}',
+    r'\d{1,2}(?:st|nd|rd|th)?\s+(january|february|march|april|may|june|july|august|september|october|november|december)',
+])
+
+_RELATIVE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in [
+    r'by\s+(next\s+week|this\s+week|friday|monday|tuesday|wednesday|thursday|saturday|sunday)',
+    r'(end of\s+week|end of\s+month)',
+    r'(tomorrow|asap|immediately|soon)',
+    r'(next\s+monday|next\s+tuesday|next\s+wednesday|next\s+thursday|next\s+friday)',
+    r'by\s+(monday|tuesday|wednesday|thursday|friday|saturday|sunday)',
+])
+
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+
+
+async def _empty_result() -> list:
+    """
+    Empty result for an extraction method that is unavailable
+    """
+    return []
+
+
+@lru_cache(maxsize=8)
+def _split_sentences(text: str) -> tuple:
+    """
+    Split text into sentences, memoized so the extractors share one split per transcript
+    """
+    # Simple sentence splitting in one pass over the punctuation boundaries
+    sentences = []
+    start = 0
+    for boundary in _SENTENCE_SPLIT_RE.finditer(text):
+        sentence = text[start:boundary.start()].strip()
+        if len(sentence) > 10:
+            sentences.append(sentence)
+        start = boundary.end()
+    
+    sentence = text[start:].strip()
+    if len(sentence) > 10:
+        sentences.append(sentence)
+    return tuple(sentences)
+
+
+# The NER pipeline and spaCy model are shared by every instance and called from worker
+# threads; neither they nor the fast tokenizer behind NER are safe to run concurrently
+_NER_LOCK = threading.Lock()
+_NLP_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _get_spacy_nlp():
+    """
+    spaCy English model, loaded on first use; None if unavailable
+    """
+    try:
+        import spacy
+        # Only the NER component is used; skip the parser, tagger and lemmatizer
+        nlp = spacy.load("en_core_web_sm", disable=["parser", "tagger", "lemmatizer", "attribute_ruler"])
+        logger.info("spaCy model loaded successfully")
+        return nlp
+    except (OSError, ImportError) as e:
+        logger.warning(f"spaCy model not available: {e}")
+        return None
+
+
+@lru_cache(maxsize=1)
+def _get_ner_pipeline():
+    """
+    int8-quantized NER pipeline, loaded on first use; None if unavailable
+    """
+    try:
+        # Initialize NER pipeline for person extraction
+        logger.info("Loading NER model for entity recognition")
+        ner_pipeline = pipeline(
+            "ner",
+            model=settings.NER_MODEL,
+            tokenizer=settings.NER_MODEL,
+            aggregation_strategy="simple",
+            device=-1  # Use CPU
+        )
+        # int8 dynamic quantization of the Linear layers for faster CPU inference
+        ner_pipeline.model = torch.quantization.quantize_dynamic(
+            ner_pipeline.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        logger.info("NER model loaded successfully")
+        return ner_pipeline
+    except Exception as e:
+        logger.warning(f"Failed to load NER model: {e}")
+        return None
 
 
 class TaskExtractor:
     def __init__(self):
         logger.info("Initializing TaskExtractor")
         
-        try:
-            # Initialize NER pipeline for person extraction
-            logger.info("Loading NER model for entity recognition")
-            self.ner_pipeline = pipeline(
-                "ner",
-                model="dbmdz/bert-large-cased-finetuned-conll03-english",
-                tokenizer="dbmdz/bert-large-cased-finetuned-conll03-english",
-                aggregation_strategy="simple",
-                device=-1  # Use CPU
-            )
-            logger.info("NER model loaded successfully")
-        except Exception as e:
-            logger.warning(f"Failed to load NER model: {e}")
-            self.ner_pipeline = None
+        # Models are loaded once per process and shared by every instance
+        self.ner_pipeline = _get_ner_pipeline()
+        self.nlp = _get_spacy_nlp()
+        
+        # LRU of participant lists keyed by text digest
+        self._participant_cache: OrderedDict = OrderedDict()
         
         # Common task-related keywords
         self.task_keywords = [
@@ -62,6 +207,48 @@ class TaskExtractor:
             'approve', 'check', 'verify', 'confirm', 'analyze',
             'research', 'investigate', 'plan', 'book', 'reserve'
         ]
+        
+        # Imperative mood indicators that open an action sentence
+        self.imperative_starters = [
+            'we need to', 'we should', 'let\'s', 'please', 'make sure',
+            'don\'t forget', 'remember to', 'ensure that', 'follow up'
+            'someone should', 'we must', 'it would be good to', 'we have to'
+        ]
+        
+        self._action_verb_patterns = [
+            (verb, re.compile(rf'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+(?:will|should|can|must)?\s*{verb}\s+([^.!?\n]+)', re.IGNORECASE))
+            for verb in self.action_verbs
+        ]
+        # All of the verb patterns as one alternation. A sentence it does not match cannot
+        # match any of them, so one scan rules out most sentences
+        verb_alternation = '|'.join(map(re.escape, self.action_verbs))
+        self._action_verb_re = re.compile(
+            rf'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+(?:will|should|can|must)?\s*(?:{verb_alternation})\s+([^.!?\n]+)',
+            re.IGNORECASE
+        )
+        
+        # Priority keywords
+        self.high_priority_keywords = ['urgent', 'asap', 'immediately', 'critical', 'high priority', 'deadline', 'must', 'emergency']
+        self.medium_priority_keywords = ['important', 'soon', 'this week', 'next week', 'should', 'needs to']
+        
+        # Aho-Corasick automatons find every keyword in one linear pass over a sentence
+        self._priority_automaton = ahocorasick.Automaton()
+        for keyword in self.medium_priority_keywords:
+            self._priority_automaton.add_word(keyword, 'medium')
+        for keyword in self.high_priority_keywords:
+            self._priority_automaton.add_word(keyword, 'high')
+        self._priority_automaton.make_automaton()
+        
+        self._action_automaton = ahocorasick.Automaton()
+        for keyword in self.task_keywords + self.action_verbs:
+            self._action_automaton.add_word(keyword, keyword)
+        self._action_automaton.make_automaton()
+    
+    def clear_cache(self):
+        """
+        Drop all cached participant results
+        """
+        self._participant_cache.clear()
     
     async def extract_tasks(self, text: str) -> List[Dict]:
         """
@@ -70,16 +257,18 @@ class TaskExtractor:
         try:
             logger.info("Starting task extraction")
             
-            # Method 1: Rule-based extraction
-            rule_based_tasks = self._rule_based_task_extraction(text)
+            sentences = self._split_into_sentences(text)
             
-            # Method 2: NLP-based extraction (if available)
-            nlp_based_tasks = []
-            if self.ner_pipeline:
-                nlp_based_tasks = self._nlp_based_task_extraction(text)
+            # Run the methods in worker threads so CPU-bound extraction doesn't block the event loop
+            rule_based_tasks, pattern_based_tasks = await asyncio.gather(
+                # Method 1: Rule-based extraction
+                asyncio.to_thread(self._rule_based_task_extraction, sentences),
+                # Method 3: Pattern-based extraction for common task structures
+                asyncio.to_thread(self._pattern_based_task_extraction, sentences)
+            )
             
-            # Method 3: Pattern-based extraction for common task structures
-            pattern_based_tasks = self._pattern_based_task_extraction(text)
+            # Method 2: NLP-based extraction (if available); a placeholder, so no thread for it
+            nlp_based_tasks = self._nlp_based_task_extraction(text) if self.ner_pipeline else []
             
             # Combine and deduplicate tasks
             all_tasks = rule_based_tasks + nlp_based_tasks + pattern_based_tasks
@@ -102,22 +291,8 @@ class TaskExtractor:
             action_points = []
             
             # Look for explicit action items
-            action_patterns = [
-                r'action item[s]?:?\s*([^.!?\n]+)',
-                r'action[s]?:?\s*([^.!?\n]+)',
-                r'next step[s]?:?\s*([^.!?\n]+)',
-                r'follow[- ]?up:?\s*([^.!?\n]+)',
-                r'to[- ]?do:?\s*([^.!?\n]+)',
-                r'we need to\s+([^.!?\n]+)',
-                r'we should\s+([^.!?\n]+)',
-                r'let\'s\s+([^.!?\n]+)',
-                r'someone should\s+([^.!?\n]+)',
-                r'we must\s+([^.!?\n]+)',
-                r'it would be good to\s+([^.!?\n]+)'
-            ]
-            
-            for pattern in action_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
+            for pattern in _ACTION_PATTERNS:
+                matches = pattern.findall(text)
                 for match in matches:
                     cleaned_action = match.strip()
                     if len(cleaned_action) > 10:  # Filter out very short matches
@@ -130,15 +305,8 @@ class TaskExtractor:
                     action_points.append(sentence.strip())
             
             # Look for decision-based action points
-            decision_patterns = [
-                r'decided to\s+([^.!?\n]+)',
-                r'agreed to\s+([^.!?\n]+)',
-                r'committed to\s+([^.!?\n]+)',
-                r'will proceed with\s+([^.!?\n]+)'
-            ]
-            
-            for pattern in decision_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
+            for pattern in _DECISION_PATTERNS:
+                matches = pattern.findall(text)
                 for match in matches:
                     cleaned_action = match.strip()
                     if len(cleaned_action) > 10:
@@ -159,41 +327,43 @@ class TaskExtractor:
         """
         Extract participant names from meeting transcript
         """
+        cache_key = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+        if cache_key in self._participant_cache:
+            logger.info("Returning cached participants")
+            self._participant_cache.move_to_end(cache_key)
+            return list(self._participant_cache[cache_key])
+        
         try:
             logger.info("Starting participant extraction")
             
             participants = set()
             
-            # Method 1: Use NER pipeline if available
-            if self.ner_pipeline:
-                entities = self.ner_pipeline(text)
+            # Sentence-sized chunks: short inputs batch well and stay within the model's token limit
+            chunks = [chunk for chunk in _SENTENCE_SPLIT_RE.split(text) if chunk.strip()]
+            
+            # Run both NER models in worker threads; their inference releases the GIL
+            entity_batches, docs = await asyncio.gather(
+                # Method 1: Use NER pipeline if available
+                asyncio.to_thread(self._run_ner, chunks) if self.ner_pipeline and chunks else _empty_result(),
+                # Method 2: Use spaCy if available, batching sentence-sized chunks
+                asyncio.to_thread(self._run_spacy, chunks) if self.nlp else _empty_result()
+            )
+            
+            for entities in entity_batches:
                 for entity in entities:
                     if entity['entity_group'] == 'PER':
                         name = entity['word'].replace('##', '')
                         if len(name) > 2:
                             participants.add(name.title())
             
-            # Method 2: Use spaCy if available
-            if nlp:
-                doc = nlp(text)
+            for doc in docs:
                 for ent in doc.ents:
                     if ent.label_ == "PERSON":
                         participants.add(ent.text.title())
             
             # Method 3: Pattern matching for speaker labels
-            speaker_patterns = [
-                r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?):',  # "John Smith:"
-                r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+said',  # "John said"
-                r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+mentioned',  # "John mentioned"
-                r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+will',  # "John will"
-                r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+can',  # "John can"
-                r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+should',  # "John should"
-                r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+needs? to',  # "John needs to"
-                r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+is responsible',  # "John is responsible"
-            ]
-            
-            for pattern in speaker_patterns:
-                matches = re.findall(pattern, text, re.MULTILINE)
+            for pattern in _SPEAKER_PATTERNS:
+                matches = pattern.findall(text)
                 for match in matches:
                     if isinstance(match, tuple):
                         name = match[0]
@@ -201,48 +371,62 @@ class TaskExtractor:
                         name = match
                     
                     # Filter out common words that might be matched
-                    excluded_words = ['the', 'and', 'but', 'for', 'you', 'this', 'that', 'we', 'they', 'it', 'meeting', 'team']
-                    if name.lower() not in excluded_words and len(name) > 2:
+                    if name.lower() not in _EXCLUDED_SPEAKER_WORDS and len(name) > 2:
                         participants.add(name.title())
             
             # Filter out very common false positives
             filtered_participants = []
             for participant in participants:
-                if not any(word in participant.lower() for word in ['meeting', 'team', 'group', 'everyone', 'somebody', 'anyone']):
+                if not any(word in participant.lower() for word in _FALSE_POSITIVE_PARTICIPANT_WORDS):
                     filtered_participants.append(participant)
             
             logger.info(f"Extracted {len(filtered_participants)} participants")
-            return filtered_participants[:12]  # Limit to 12 participants
+            result = filtered_participants[:12]  # Limit to 12 participants
+            
+            self._participant_cache[cache_key] = result
+            if len(self._participant_cache) > settings.RESULT_CACHE_SIZE:
+                self._participant_cache.popitem(last=False)
+            return list(result)
         
         except Exception as e:
             logger.error(f"Participant extraction failed: {e}")
             return []
     
-    def _rule_based_task_extraction(self, text: str) -> List[Dict]:
+    def _run_ner(self, chunks: List[str]) -> list:
+        """
+        Run the shared NER pipeline over a batch of chunks, one caller at a time
+        """
+        with _NER_LOCK:
+            return self.ner_pipeline(
+                chunks,
+                batch_size=settings.NER_BATCH_SIZE,
+                ignore_labels=["O", "MISC", "ORG", "LOC"]
+            )
+    
+    def _run_spacy(self, chunks: List[str]) -> list:
+        """
+        Run the shared spaCy model over a batch of chunks, one caller at a time
+        """
+        with _NLP_LOCK:
+            return list(self.nlp.pipe(chunks, batch_size=settings.SPACY_BATCH_SIZE))
+    
+    def _rule_based_task_extraction(self, sentences: List[str]) -> List[Dict]:
         """
         Extract tasks using rule-based approach
         """
         tasks = []
-        sentences = self._split_into_sentences(text)
         
         for sentence in sentences:
-            # Look for assignment patterns
-            assignment_patterns = [
-                r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+will\s+([^.!?\n]+)',
-                r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+should\s+([^.!?\n]+)',
-                r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+needs? to\s+([^.!?\n]+)',
-                r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+is responsible for\s+([^.!?\n]+)',
-                r'assign(?:ed)?\s+([^.!?\n]+?)\s+to\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',
-                r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+can\s+([^.!?\n]+)',
-                r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+must\s+([^.!?\n]+)',
-                r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+has to\s+([^.!?\n]+)',
-            ]
+            # The "assign X to Y" pattern needs the literal word, so this check is exact
+            if not _COMBINED_TASK_RE.search(sentence) and 'assign' not in sentence.lower():
+                continue
             
-            for pattern in assignment_patterns:
-                matches = re.findall(pattern, sentence, re.IGNORECASE)
+            # Look for assignment patterns
+            for pattern, is_reversed in _ASSIGNMENT_PATTERNS:
+                matches = pattern.findall(sentence)
                 for match in matches:
                     if len(match) == 2:
-                        if 'assign' in pattern:
+                        if is_reversed:
                             task_desc, assignee = match  # Reversed for "assign X to Y" pattern
                         else:
                             assignee, task_desc = match
@@ -259,18 +443,20 @@ class TaskExtractor:
         
         return tasks
     
-    def _pattern_based_task_extraction(self, text: str) -> List[Dict]:
+    def _pattern_based_task_extraction(self, sentences: List[str]) -> List[Dict]:
         """
         Extract tasks using common meeting patterns
         """
         tasks = []
-        sentences = self._split_into_sentences(text)
         
         for sentence in sentences:
-            # Look for action verb patterns
-            for verb in self.action_verbs:
-                pattern = rf'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+(?:will|should|can|must)?\s*{verb}\s+([^.!?\n]+)'
-                matches = re.findall(pattern, sentence, re.IGNORECASE)
+            if not self._action_verb_re.search(sentence):
+                continue
+            
+            # Look for action verb patterns; separate scans, since one verb's task text
+            # can run over the next assignment in the same sentence
+            for verb, pattern in self._action_verb_patterns:
+                matches = pattern.findall(sentence)
                 for match in matches:
                     assignee, task_desc = match
                     deadline = self._extract_deadline(sentence)
@@ -298,29 +484,14 @@ class TaskExtractor:
         Extract deadline information from sentence
         """
         # Look for explicit dates
-        date_patterns = [
-            r'\d{1,2}[/-]\d{1,2}[/-]\d{4}',
-            r'\d{4}-\d{2}-\d{2}',
-            r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}',
-            r'\d{1,2}(?:st|nd|rd|th)?\s+(january|february|march|april|may|june|july|august|september|october|november|december)',
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, sentence, re.IGNORECASE)
+        for pattern in _DATE_PATTERNS:
+            match = pattern.search(sentence)
             if match:
                 return match.group()
         
         # Look for relative time expressions
-        relative_patterns = [
-            r'by\s+(next\s+week|this\s+week|friday|monday|tuesday|wednesday|thursday|saturday|sunday)',
-            r'(end of\s+week|end of\s+month)',
-            r'(tomorrow|asap|immediately|soon)',
-            r'(next\s+monday|next\s+tuesday|next\s+wednesday|next\s+thursday|next\s+friday)',
-            r'by\s+(monday|tuesday|wednesday|thursday|friday|saturday|sunday)',
-        ]
-        
-        for pattern in relative_patterns:
-            match = re.search(pattern, sentence, re.IGNORECASE)
+        for pattern in _RELATIVE_PATTERNS:
+            match = pattern.search(sentence)
             if match:
                 return self._convert_relative_date(match.group())
         
@@ -365,18 +536,13 @@ class TaskExtractor:
         """
         sentence_lower = sentence.lower()
         
-        high_priority_keywords = ['urgent', 'asap', 'immediately', 'critical', 'high priority', 'deadline', 'must', 'emergency']
-        medium_priority_keywords = ['important', 'soon', 'this week', 'next week', 'should', 'needs to']
-        
-        for keyword in high_priority_keywords:
-            if keyword in sentence_lower:
+        priority = 'low'
+        for _, level in self._priority_automaton.iter(sentence_lower):
+            if level == 'high':
                 return 'high'
+            priority = 'medium'
         
-        for keyword in medium_priority_keywords:
-            if keyword in sentence_lower:
-                return 'medium'
-        
-        return 'low'
+        return priority
     
     def _is_action_sentence(self, sentence: str) -> bool:
         """
@@ -385,63 +551,47 @@ class TaskExtractor:
         sentence_lower = sentence.lower().strip()
         
         # Check for imperative mood indicators
-        imperative_starters = [
-            'we need to', 'we should', 'let\'s', 'please', 'make sure',
-            'don\'t forget', 'remember to', 'ensure that', 'follow up'
-            'someone should', 'we must', 'it would be good to', 'we have to'
-        ]
-        
-        for starter in imperative_starters:
-            if sentence_lower.startswith(starter):
-                return True
-        
-        # Check for action keywords
-        for keyword in self.task_keywords:
-            if keyword in sentence_lower:
-                return True
+        if sentence_lower.startswith(tuple(self.imperative_starters)):
+            return True
         
-        # Check for action verbs
-        for verb in self.action_verbs:
-            if verb in sentence_lower:
-                return True
-        
-        return False
+        # Check for action keywords and verbs
+        return next(self._action_automaton.iter(sentence_lower), None) is not None
     
     def _split_into_sentences(self, text: str) -> List[str]:
         """
         Split text into sentences
         """
-        # Simple sentence splitting
-        sentences = re.split(r'[.!?]+', text)
-        return [s.strip() for s in sentences if len(s.strip()) > 10]
+        return list(_split_sentences(text))
     
     def _deduplicate_tasks(self, tasks: List[Dict]) -> List[Dict]:
         """
         Remove duplicate tasks based on similarity
         """
         unique_tasks = []
+        unique_words = []
+        # word -> indices of unique tasks containing it; similar tasks must share a word
+        word_index: Dict[str, List[int]] = {}
         
         for task in tasks:
-            is_duplicate = False
-            for existing_task in unique_tasks:
-                # Simple similarity check based on task description
-                if self._are_tasks_similar(task['task'], existing_task['task']):
-                    is_duplicate = True
-                    break
+            words = frozenset(task['task'].lower().split())
             
-            if not is_duplicate:
-                unique_tasks.append(task)
+            # Simple similarity check against tasks sharing at least one word
+            candidates = {i for word in words for i in word_index.get(word, ())}
+            if any(self._are_tasks_similar(words, unique_words[i]) for i in candidates):
+                continue
+            
+            for word in words:
+                word_index.setdefault(word, []).append(len(unique_tasks))
+            unique_tasks.append(task)
+            unique_words.append(words)
         
         return unique_tasks
     
-    def _are_tasks_similar(self, task1: str, task2: str, threshold: float = 0.7) -> bool:
+    def _are_tasks_similar(self, words1: frozenset, words2: frozenset, threshold: float = 0.7) -> bool:
         """
-        Check if two tasks are similar
+        Check if two tasks are similar, given their lowercased word sets
         """
         # Simple word overlap similarity
-        words1 = set(task1.lower().split())
-        words2 = set(task2.lower().split())
-        
         if not words1 or not words2:
             return False
         
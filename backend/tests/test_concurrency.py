@@ -0,0 +1,75 @@
+"""
+Concurrent transcript processing against the shared model pipelines
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import main
+import task_extractor
+import text_summarizer
+from task_extractor import TaskExtractor
+from text_summarizer import TextSummarizer
+
+
+class BorrowCheckingPipeline:
+    """
+    Stand-in for a shared pipeline that fails like a fast tokenizer ("Already borrowed")
+    when two threads call it at once
+    """
+    
+    def __init__(self, make_result):
+        self._make_result = make_result
+        self._borrowed = threading.Lock()
+        self.calls = 0
+    
+    def __call__(self, inputs, **kwargs):
+        if not self._borrowed.acquire(blocking=False):
+            raise RuntimeError("Already borrowed")
+        try:
+            time.sleep(0.02)  # Hold the pipeline long enough for concurrent callers to collide
+            self.calls += 1
+            return [self._make_result(item) for item in inputs]
+        finally:
+            self._borrowed.release()
+    
+    def pipe(self, inputs, batch_size=None):
+        return self(inputs)
+
+
+@pytest.fixture
+def pipelines(monkeypatch):
+    summarizer = BorrowCheckingPipeline(lambda chunk: {"summary_text": "Stub summary."})
+    # A name that is not in the transcripts, so it can only come from the NER pipeline
+    ner = BorrowCheckingPipeline(lambda chunk: [{"entity_group": "PER", "word": "Bob"}])
+    nlp = BorrowCheckingPipeline(lambda chunk: SimpleNamespace(ents=[]))
+    
+    monkeypatch.setattr(text_summarizer, "_get_summarizer", lambda model_type: summarizer)
+    monkeypatch.setattr(task_extractor, "_get_ner_pipeline", lambda: ner)
+    monkeypatch.setattr(task_extractor, "_get_spacy_nlp", lambda: nlp)
+    monkeypatch.setattr(main, "text_summarizer", TextSummarizer(model_type="huggingface"))
+    monkeypatch.setattr(main, "task_extractor", TaskExtractor())
+    return summarizer, ner, nlp
+
+
+def test_concurrent_transcripts_share_pipelines_safely(pipelines):
+    summarizer, ner, nlp = pipelines
+    # Distinct transcripts so the summary and participant caches don't short-circuit
+    transcripts = [
+        f"Meeting {i}. Alice will send the report to the team by Friday. " * 10
+        for i in range(6)
+    ]
+    
+    async def process_all():
+        return await asyncio.gather(*(main.process_transcript(t) for t in transcripts))
+    
+    results = asyncio.run(process_all())
+    
+    # A collision would be swallowed into the extractive fallback / an empty NER result
+    assert [result.summary for result in results] == ["Stub summary."] * len(transcripts)
+    assert all("Bob" in result.participants for result in results)
+    assert summarizer.calls == ner.calls == nlp.calls == len(transcripts)
@@ -3,14 +3,26 @@ Text summarization module using various NLP models
 """
 
 from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
+import torch
+import asyncio
 from typing import List, Dict, Optional
+from collections import OrderedDict
+from functools import lru_cache
+import hashlib
+import os
 import re
+import shutil
+import tempfile
+import threading
 import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
+from nltk.tokenize import sent_tokenize
 from nltk.corpus import stopwords
-from nltk.frequency import FreqDist
+import numpy as np
+from numba import njit
 import logging
 
+from config import settings
+
 logger = logging.getLogger(__name__)
 
 # Download required NLTK data
@@ -26,68 +38,188 @@ except LookupError:
     logger.info("Downloading NLTK stopwords")
     nltk.download('stopwords')
 
-class TextSummarizer:
-    def __init__(self, model_type: str = "huggingface"):
-        self.model_type = model_type
-        logger.info(f"Initializing TextSummarizer with model type: {model_type}")
-        
-        if model_type == "huggingface":
-            try:
-                # Initialize HuggingFace BART model for summarization
-                logger.info("Loading BART model for summarization")
-                self.summarizer = pipeline(
-                    "summarization",
-                    model="facebook/bart-large-cnn",
-                    tokenizer="facebook/bart-large-cnn",
-                    device=-1,  # Use CPU
-                    framework="pt"
-                )
-                logger.info("BART model loaded successfully")
-            except Exception as e:
-                logger.error(f"Failed to load BART model: {e}")
-                # Fallback to smaller model
-                try:
-                    logger.info("Falling back to DistilBART model")
-                    self.summarizer = pipeline(
-                        "summarization",
-                        model="sshleifer/distilbart-cnn-12-6",
-                        device=-1
-                    )
-                except Exception as e2:
-                    logger.error(f"Failed to load fallback model: {e2}")
-                    self.summarizer = None
-        
-        elif model_type == "t5":
+# Precompiled patterns for text preprocessing
+_WHITESPACE_RE = re.compile(r'\s+')
+# Leading label only; whitespace is collapsed last, so the pattern must not match per line
+_SPEAKER_LABEL_RE = re.compile(r'\A[A-Za-z\s]+:\s*')
+_TIMESTAMP_RE = re.compile(r'\[\d{2}:\d{2}:\d{2}\]')
+_FILLERS_RE = re.compile(r'\b(?:um|uh|er|ah|like|you\s+know|so|well)\b', re.IGNORECASE)
+# Alphanumeric runs, i.e. the tokens that survive an isalnum() filter
+_WORD_RE = re.compile(r'[^\W_]+')
+
+# Token budget for each chunk's summary, independent of the final length; a ~1000 character
+# chunk shrinks about 3x per round, so long transcripts are reduced hierarchically
+_CHUNK_SUMMARY_MAX_LENGTH = 60
+_CHUNK_SUMMARY_MIN_LENGTH = 15
+
+@njit(cache=True)
+def _score_sentences(word_freq, sent_offsets, sent_words):
+    """
+    Mean word frequency per sentence; -1 for sentences without scored words
+    """
+    num_sentences = len(sent_offsets) - 1
+    scores = np.full(num_sentences, -1.0)
+    for i in range(num_sentences):
+        start, end = sent_offsets[i], sent_offsets[i + 1]
+        if end > start:
+            total = 0.0
+            for j in range(start, end):
+                total += word_freq[sent_words[j]]
+            scores[i] = total / (end - start)
+    return scores
+
+# Compile (or load the cached build) at import so no request pays the JIT cost
+_score_sentences(np.ones(1), np.array([0, 1], dtype=np.int64), np.zeros(1, dtype=np.int32))
+
+def _text_digest(text: str) -> str:
+    """
+    Short, fast hash of a text used as a cache key
+    """
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+def _quantize_dynamic(model):
+    """
+    int8 dynamic quantization of a PyTorch model's Linear layers for faster CPU inference
+    """
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def _load_onnx_int8_pipeline(model_id: str, upload_dir: str):
+    """
+    Build (once) and load a graph-optimized, dynamically int8-quantized ONNX export of a seq2seq model
+    """
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTOptimizer, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoOptimizationConfig, AutoQuantizationConfig
+    
+    model_dir = os.path.join(upload_dir, "models", f"{model_id.replace('/', '--')}-o2-int8")
+    onnx_files = ["encoder_model_optimized.onnx", "decoder_model_optimized.onnx", "decoder_with_past_model_optimized.onnx"]
+    
+    expected_files = ["config.json"] + [f.replace(".onnx", "_quantized.onnx") for f in onnx_files]
+    
+    if not all(os.path.isfile(os.path.join(model_dir, f)) for f in expected_files):
+        logger.info(f"Exporting {model_id} to ONNX with int8 weights: {model_dir}")
+        # Build in a scratch directory and move it into place only once complete,
+        # so an interrupted export is rebuilt on the next start instead of loaded
+        models_dir = os.path.dirname(model_dir)
+        os.makedirs(models_dir, exist_ok=True)
+        build_dir = tempfile.mkdtemp(prefix=f"{os.path.basename(model_dir)}-", dir=models_dir)
+        try:
+            export_dir = os.path.join(build_dir, "fp32")
+            quantized_dir = os.path.join(build_dir, "int8")
+            model = ORTModelForSeq2SeqLM.from_pretrained(model_id, export=True, use_cache=True)
+            
+            # Fuse attention, GELU and LayerNorm subgraphs before quantizing the fused graph
+            optimizer = ORTOptimizer.from_pretrained(model)
+            optimizer.optimize(save_dir=export_dir, optimization_config=AutoOptimizationConfig.O2())
+            
+            # Dynamic int8 quantization using VNNI int8 dot-product kernels
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            for file_name in onnx_files:
+                quantizer = ORTQuantizer.from_pretrained(export_dir, file_name=file_name)
+                quantizer.quantize(save_dir=quantized_dir, quantization_config=qconfig)
+            AutoTokenizer.from_pretrained(model_id).save_pretrained(quantized_dir)
+            
+            shutil.rmtree(model_dir, ignore_errors=True)
+            os.rename(quantized_dir, model_dir)
+        finally:
+            # Also drops the full-precision export
+            shutil.rmtree(build_dir, ignore_errors=True)
+    
+    model = ORTModelForSeq2SeqLM.from_pretrained(
+        model_dir,
+        encoder_file_name="encoder_model_optimized_quantized.onnx",
+        decoder_file_name="decoder_model_optimized_quantized.onnx",
+        decoder_with_past_file_name="decoder_with_past_model_optimized_quantized.onnx",
+        provider="CPUExecutionProvider"
+    )
+    tokenizer = AutoTokenizer.from_pretrained(model_dir, use_fast=True)
+    
+    return pipeline("summarization", model=model, tokenizer=tokenizer)
+
+# Summarization pipelines are shared by every instance and called from worker threads;
+# neither they nor their fast tokenizers are safe to run concurrently
+_SUMMARIZER_LOCK = threading.Lock()
+
+@lru_cache(maxsize=None)
+def _get_summarizer(model_type: str):
+    """
+    Summarization pipeline for a model type, loaded on first use; None if unavailable
+    """
+    if model_type in ("huggingface", "bart-large"):
+        try:
+            # Distilled BART by default, exported to ONNX with int8 weights;
+            # "bart-large" opts in to the full-size model at roughly twice the cost
+            model_id = settings.SUMMARIZER_MODEL if model_type == "huggingface" else "facebook/bart-large-cnn"
+            logger.info(f"Loading BART model for summarization: {model_id} (ONNX Runtime, int8)")
+            summarizer = _load_onnx_int8_pipeline(model_id, settings.UPLOAD_DIR)
+            logger.info("BART model loaded successfully")
+        except Exception as e:
+            logger.error(f"Failed to load BART model: {e}")
+            # Fallback to smaller model
             try:
-                # Alternative: T5 model
-                self.model_name = "t5-small"
-                logger.info(f"Loading T5 model: {self.model_name}")
-                self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-                self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
-                self.summarizer = pipeline(
+                logger.info("Falling back to DistilBART model")
+                summarizer = pipeline(
                     "summarization",
-                    model=self.model,
-                    tokenizer=self.tokenizer,
+                    model="sshleifer/distilbart-cnn-12-6",
+                    use_fast=True,
                     device=-1
                 )
-                logger.info("T5 model loaded successfully")
-            except Exception as e:
-                logger.error(f"Failed to load T5 model: {e}")
-                self.summarizer = None
+                summarizer.model = _quantize_dynamic(summarizer.model)
+            except Exception as e2:
+                logger.error(f"Failed to load fallback model: {e2}")
+                summarizer = None
+    
+    elif model_type == "t5":
+        try:
+            # Alternative: T5 model
+            model_name = "t5-small"
+            logger.info(f"Loading T5 model: {model_name}")
+            tokenizer = AutoTokenizer.from_pretrained(model_name)
+            model = _quantize_dynamic(AutoModelForSeq2SeqLM.from_pretrained(model_name))
+            summarizer = pipeline(
+                "summarization",
+                model=model,
+                tokenizer=tokenizer,
+                device=-1
+            )
+            logger.info("T5 model loaded successfully")
+        except Exception as e:
+            logger.error(f"Failed to load T5 model: {e}")
+            summarizer = None
+    
+    else:
+        summarizer = None
+    
+    return summarizer
+
+class TextSummarizer:
+    def __init__(self, model_type: str = "huggingface"):
+        self.model_type = model_type
+        logger.info(f"Initializing TextSummarizer with model type: {model_type}")
         
-        else:
-            self.summarizer = None
+        # Models are loaded once per process and shared by every instance
+        self.summarizer = _get_summarizer(model_type)
         
         try:
             self.stop_words = set(stopwords.words('english'))
         except Exception as e:
             logger.warning(f"Failed to load stopwords: {e}")
             self.stop_words = set()
+        
+        # LRU of model summaries keyed by (text digest, max_length, min_length)
+        self._cache_size = settings.RESULT_CACHE_SIZE
+        self._summary_cache: OrderedDict = OrderedDict()
+    
+    def clear_cache(self):
+        """
+        Drop all cached summaries
+        """
+        self._summary_cache.clear()
     
     async def summarize(self, text: str, max_length: int = 150, min_length: int = 50) -> str:
         """
         Generate summary of the input text
         """
+        sentences = None
         try:
             logger.info(f"Starting summarization. Text length: {len(text)} characters")
             
@@ -100,8 +232,20 @@ class TextSummarizer:
             
             # Use model-based summarization if available
             if self.summarizer:
-                summary = await self._huggingface_summarize(cleaned_text, max_length, min_length)
+                cache_key = (_text_digest(cleaned_text), max_length, min_length)
+                if cache_key in self._summary_cache:
+                    logger.info("Returning cached summary")
+                    self._summary_cache.move_to_end(cache_key)
+                    return self._summary_cache[cache_key]
+                
+                # Split once, only on a cache miss; the chunker and the extractive fallback reuse it
+                sentences = sent_tokenize(cleaned_text)
+                summary = await self._huggingface_summarize(cleaned_text, sentences, max_length, min_length)
                 logger.info(f"Model-based summarization completed. Summary length: {len(summary)} characters")
+                
+                self._summary_cache[cache_key] = summary
+                if len(self._summary_cache) > self._cache_size:
+                    self._summary_cache.popitem(last=False)
                 return summary
             else:
                 logger.info("Using extractive summarization fallback")
@@ -111,112 +255,115 @@ class TextSummarizer:
             # Fallback to extractive summarization
             logger.error(f"Model summarization failed: {e}")
             logger.info("Falling back to extractive summarization")
+            if sentences is not None:
+                return self._extractive_summarization(cleaned_text, sentences=sentences)
             return self._extractive_summarization(text)
     
-    async def _huggingface_summarize(self, text: str, max_length: int, min_length: int) -> str:
+    async def _huggingface_summarize(self, text: str, sentences: List[str], max_length: int, min_length: int) -> str:
         """
         Summarize using HuggingFace models
         """
         try:
             # Handle long text by chunking
             max_chunk_length = 1000  # Conservative chunk size
-            if len(text) > max_chunk_length:
-                logger.info("Text is long, chunking for processing")
-                chunks = self._chunk_text(text, max_chunk_length)
-                summaries = []
-                
-                for i, chunk in enumerate(chunks):
-                    logger.info(f"Processing chunk {i+1}/{len(chunks)}")
-                    result = self.summarizer(
-                        chunk,
-                        max_length=min(max_length // len(chunks), 100),
-                        min_length=min(min_length // len(chunks), 20),
-                        do_sample=False,
-                        clean_up_tokenization_spaces=True
-                    )
-                    summaries.append(result[0]['summary_text'])
-                
-                # Combine chunk summaries
-                combined_summary = " ".join(summaries)
-                
-                # Summarize the combined summary if it's still too long
-                if len(combined_summary.split()) > max_length:
-                    logger.info("Combined summary still long, doing final summarization")
-                    final_result = self.summarizer(
-                        combined_summary,
-                        max_length=max_length,
-                        min_length=min_length,
-                        do_sample=False,
-                        clean_up_tokenization_spaces=True
-                    )
-                    return final_result[0]['summary_text']
-                
-                return combined_summary
+            if len(text) <= max_chunk_length:
+                return (await self._summarize_batch([text], max_length, min_length))[0]
             
-            else:
-                result = self.summarizer(
-                    text,
-                    max_length=max_length,
-                    min_length=min_length,
-                    do_sample=False,
-                    clean_up_tokenization_spaces=True
-                )
-                return result[0]['summary_text']
+            logger.info("Text is long, chunking for processing")
+            summaries = await self._summarize_chunks(self._chunk_text(sentences, max_chunk_length), max_length, min_length)
+            
+            # Summarize the combined summaries until they fit the budget; each round
+            # shrinks the chunk count since chunk summaries are much shorter than chunks
+            while len(summaries) > 1 and sum(len(summary.split()) for summary in summaries) > max_length:
+                chunks = self._chunk_text(sent_tokenize(" ".join(summaries)), max_chunk_length)
+                if len(chunks) >= len(summaries):
+                    break  # Another round would not reduce anything
+                logger.info(f"Combined summary of {len(summaries)} chunks still long, summarizing again")
+                summaries = await self._summarize_chunks(chunks, max_length, min_length)
+            
+            return " ".join(summaries)
         
         except Exception as e:
             logger.error(f"HuggingFace summarization error: {e}")
             raise Exception(f"HuggingFace summarization failed: {e}")
     
-    def _extractive_summarization(self, text: str, num_sentences: int = 3) -> str:
+    async def _summarize_chunks(self, chunks: List[str], max_length: int, min_length: int) -> List[str]:
+        """
+        Summarize chunks; a single chunk gets the full length budget, several get the per-chunk cap
+        """
+        if len(chunks) == 1:
+            return await self._summarize_batch(chunks, max_length, min_length)
+        
+        logger.info(f"Processing {len(chunks)} chunks")
+        return await self._summarize_batch(
+            chunks,
+            min(max_length, _CHUNK_SUMMARY_MAX_LENGTH),
+            min(min_length, _CHUNK_SUMMARY_MIN_LENGTH)
+        )
+    
+    async def _summarize_batch(self, chunks: List[str], max_length: int, min_length: int) -> List[str]:
+        """
+        Run the summarization pipeline over a list of texts in batches
+        """
+        # Off the event loop, so extraction and other requests proceed during generation
+        results = await asyncio.to_thread(self._run_summarizer, chunks, max_length, min_length)
+        return [result['summary_text'] for result in results]
+    
+    def _run_summarizer(self, chunks: List[str], max_length: int, min_length: int) -> list:
+        """
+        Call the shared summarization pipeline, one caller at a time
+        """
+        with _SUMMARIZER_LOCK:
+            return self.summarizer(
+                chunks,
+                max_length=max_length,
+                min_length=min_length,
+                do_sample=False,
+                clean_up_tokenization_spaces=True,
+                batch_size=4,
+                truncation=True  # Keep oversized chunks within the model's input limit
+            )
+    
+    def _extractive_summarization(self, text: str, num_sentences: int = 3,
+                                  sentences: Optional[List[str]] = None) -> str:
         """
         Fallback extractive summarization using frequency analysis
         """
         try:
             logger.info("Performing extractive summarization")
             
-            sentences = sent_tokenize(text)
+            if sentences is None:
+                sentences = sent_tokenize(text)
             if len(sentences) <= num_sentences:
                 return text
                 
-            words = word_tokenize(text.lower())
+            # Tokenize each sentence once; the same tokens feed the global frequencies
+            sentence_words = [_WORD_RE.findall(sentence.lower()) for sentence in sentences]
             
-            # Remove stopwords and punctuation
-            words = [word for word in words if word.isalnum() and word not in self.stop_words]
+            # Map non-stopword words to integer ids, laid out per sentence (CSR-style)
+            vocab = {}
+            sent_words = []
+            sent_offsets = [0]
+            for words in sentence_words:
+                for word in words:
+                    if word not in self.stop_words:
+                        sent_words.append(vocab.setdefault(word, len(vocab)))
+                sent_offsets.append(len(sent_words))
             
-            if not words:
+            if not vocab:
                 return text[:500] + "..." if len(text) > 500 else text
             
-            # Calculate word frequencies
-            word_freq = FreqDist(words)
-            
-            # Score sentences based on word frequencies
-            sentence_scores = {}
-            for sentence in sentences:
-                sentence_words = word_tokenize(sentence.lower())
-                sentence_words = [word for word in sentence_words if word.isalnum()]
-                
-                score = 0
-                word_count = 0
-                for word in sentence_words:
-                    if word in word_freq:
-                        score += word_freq[word]
-                        word_count += 1
-                
-                if word_count > 0:
-                    sentence_scores[sentence] = score / word_count
-            
-            if not sentence_scores:
-                return text[:500] + "..." if len(text) > 500 else text
+            # Calculate word frequencies and score sentences by their mean word frequency
+            sent_words = np.asarray(sent_words, dtype=np.int32)
+            word_freq = np.bincount(sent_words, minlength=len(vocab)).astype(np.float64)
+            scores = _score_sentences(word_freq, np.asarray(sent_offsets, dtype=np.int64), sent_words)
             
-            # Select top sentences
-            top_sentences = sorted(sentence_scores.items(), key=lambda x: x[1], reverse=True)
-            summary_sentences = [sentence for sentence, score in top_sentences[:num_sentences]]
+            candidates = np.flatnonzero(scores >= 0)
             
-            # Maintain original order
-            summary = []
-            for sentence in sentences:
-                if sentence in summary_sentences:
-                    summary.append(sentence)
+            # Select top sentences with a partial sort, then restore original order
+            k = min(num_sentences, candidates.size)
+            top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            summary = [sentences[i] for i in np.sort(top)]
             
             result = " ".join(summary)
             logger.info(f"Extractive summarization completed. Summary length: {len(result)} characters")
@@ -230,30 +377,24 @@ class TextSummarizer:
         """
         Clean and preprocess text for better summarization
         """
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
         # Remove speaker labels (e.g., "John:", "Speaker 1:")
-        text = re.sub(r'^[A-Za-z\s]+:\s*', '', text, flags=re.MULTILINE)
+        text = _SPEAKER_LABEL_RE.sub('', text)
         
         # Remove timestamps (e.g., "[00:05:30]")
-        text = re.sub(r'\[\d{2}:\d{2}:\d{2}\]', '', text)
+        text = _TIMESTAMP_RE.sub('', text)
         
         # Remove filler words and sounds
-        filler_words = ['um', 'uh', 'er', 'ah', 'like', 'you know', 'so', 'well']
-        for filler in filler_words:
-            text = re.sub(rf'\b{filler}\b', '', text, flags=re.IGNORECASE)
+        text = _FILLERS_RE.sub('', text)
         
-        # Clean up multiple spaces
-        text = re.sub(r'\s+', ' ', text)
+        # Collapse whitespace once, after all removals
+        text = _WHITESPACE_RE.sub(' ', text)
         
         return text.strip()
     
-    def _chunk_text(self, text: str, max_length: int) -> List[str]:
+    def _chunk_text(self, sentences: List[str], max_length: int) -> List[str]:
         """
-        Split long text into manageable chunks
+        Group sentences into manageable chunks
         """
-        sentences = sent_tokenize(text)
         chunks = []
         current_chunk = ""
         